@@ -0,0 +1,22 @@
+"""
+Celery config for poets_canvas_backend project.
+
+Celery runs slow work (like calling Wikipedia) in a separate worker process,
+so web requests don't have to wait for it. Start a worker with:
+
+    celery -A poets_canvas_backend worker -l info
+"""
+
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'poets_canvas_backend.settings')
+
+app = Celery('poets_canvas_backend')
+
+# Read CELERY_* settings from Django's settings.py
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Find tasks.py in every installed app
+app.autodiscover_tasks()
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -88,6 +89,35 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Use Redis when REDIS_URL is set (production), otherwise an in-process cache.
+
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+
+# Celery (background tasks)
+# https://docs.celeryq.dev/en/stable/django/first-steps-with-django.html
+# Tasks go through Redis when REDIS_URL is set. Without it (local development)
+# they run right away in the same process, so no worker is needed.
+
+CELERY_BROKER_URL = os.environ.get('REDIS_URL', 'memory://')
+CELERY_TASK_ALWAYS_EAGER = not os.environ.get('REDIS_URL')
+CELERY_TASK_IGNORE_RESULT = True
+
+
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
 
@@ -125,9 +155,20 @@ USE_TZ = True
 STATIC_URL = 'static/'
 
 # Media files (User uploaded files)
-MEDIA_URL = '/media/'
+# Set MEDIA_URL to an absolute URL (e.g. a CDN) in production so image URLs
+# come out complete without having to add the host for every request
+MEDIA_URL = os.environ.get('MEDIA_URL', '/media/')
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Django REST Framework
+# Every list endpoint is paginated so responses stay bounded as tables grow.
+# Cursor pagination seeks from the last row seen instead of using OFFSET,
+# so deep pages cost the same as the first one.
+REST_FRAMEWORK = {
+    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.CursorPagination',
+    'PAGE_SIZE': 50,
+}
+
 CORS_ALLOWED_ORIGINS = [
     # 1. Add your React development server URL here!
     "http://localhost:5173", 
@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class QuotesConfig(AppConfig):
     name = 'quotes'
+
+    def ready(self):
+        # Register signal handlers (cache invalidation)
+        from . import signals  # noqa: F401
@@ -0,0 +1,29 @@
+# Generated by Django 6.0 on 2026-10-15 22:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0003_book_cover_image'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['title'], name='quotes_book_title_1dd143_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['era'], name='quotes_quot_era_2227af_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['-date_created', '-id'], name='quotes_quot_date_cr_0af210_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['book', '-created_at'], name='quotes_revi_book_id_de339d_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 6.0 on 2026-10-15 22:07
+
+from django.db import migrations, models
+
+
+# The materialized view behind QuoteEraCount. Only PostgreSQL supports
+# materialized views, so on other databases (SQLite in development) these
+# steps are skipped and the report falls back to a plain GROUP BY.
+CREATE_VIEW_SQL = [
+    """
+    CREATE MATERIALIZED VIEW quote_era_counts AS
+    SELECT era, COUNT(*) AS quote_count
+    FROM quotes_quote
+    GROUP BY era
+    """,
+    # REFRESH ... CONCURRENTLY needs a unique index
+    "CREATE UNIQUE INDEX quote_era_counts_era_idx ON quote_era_counts (era)",
+]
+
+DROP_VIEW_SQL = ["DROP MATERIALIZED VIEW IF EXISTS quote_era_counts"]
+
+
+def run_on_postgresql(statements):
+    def run(apps, schema_editor):
+        if schema_editor.connection.vendor != 'postgresql':
+            return
+        for sql in statements:
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0004_model_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='QuoteEraCount',
+            fields=[
+                ('era', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('quote_count', models.IntegerField()),
+            ],
+            options={
+                'db_table': 'quote_era_counts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(run_on_postgresql(CREATE_VIEW_SQL), run_on_postgresql(DROP_VIEW_SQL)),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 6.0 on 2026-10-15 22:10
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def clamp_ratings(apps, schema_editor):
+    """
+    The API used to accept any integer rating. Pull existing out-of-range
+    ratings into 1-5 so the new check constraint can be added.
+    """
+    Review = apps.get_model('quotes', 'Review')
+    Review.objects.filter(rating__lt=1).update(rating=1)
+    Review.objects.filter(rating__gt=5).update(rating=5)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0005_quote_era_counts'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='review',
+            name='rating',
+            field=models.IntegerField(default=5, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)]),
+        ),
+        migrations.RunPython(clamp_ratings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.CheckConstraint(condition=models.Q(('rating__gte', 1), ('rating__lte', 5)), name='rating_1_to_5'),
+        ),
+    ]
@@ -4,7 +4,21 @@ Database models for the Poet's Canvas application.
 These models define the structure of our data - quotes, books, and reviews.
 """
 
+from io import BytesIO
+from pathlib import Path
+
+from django.core.files.base import ContentFile
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from PIL import Image, ImageOps
+
+
+# Uploaded book covers are shrunk to fit in this box and stored as WebP
+COVER_MAX_SIZE = (800, 800)
+COVER_WEBP_QUALITY = 82
+
+# Name of the database check that keeps Review.rating between 1 and 5
+RATING_CONSTRAINT_NAME = 'rating_1_to_5'
 
 
 class Quote(models.Model):
@@ -30,6 +44,15 @@ class Quote(models.Model):
     # Automatically set when the quote is first created
     date_created = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # The report endpoint groups quotes by era
+            models.Index(fields=['era']),
+            # Quote lists are shown newest first, with id breaking ties
+            # so the order (and cursor pagination) is stable
+            models.Index(fields=['-date_created', '-id']),
+        ]
+
     def __str__(self):
         """
         Returns a nice string representation for admin panel and debugging.
@@ -53,6 +76,12 @@ class Book(models.Model):
     # This is optional since not all books might have covers uploaded
     cover_image = models.ImageField(upload_to='book_covers/', blank=True, null=True) 
 
+    class Meta:
+        indexes = [
+            # Books are always listed alphabetically
+            models.Index(fields=['title']),
+        ]
+
     def __str__(self):
         """
         Simple string representation - just the title.
@@ -60,6 +89,40 @@ class Book(models.Model):
         """
         return self.title
 
+    def save(self, *args, **kwargs):
+        """
+        Compresses a newly uploaded cover image before it's stored.
+        A file that hasn't been written to storage yet (_committed is False)
+        is a fresh upload; covers already in storage are left alone.
+        """
+        if self.cover_image and not self.cover_image._committed:
+            self.compress_cover_image()
+        super().save(*args, **kwargs)
+
+    def compress_cover_image(self):
+        """
+        Shrinks the cover to fit COVER_MAX_SIZE and re-encodes it as WebP,
+        which is usually several times smaller than the original upload.
+        If Pillow can't read the file, the original is kept as-is.
+        """
+        try:
+            image = Image.open(self.cover_image)
+            # Apply the camera's rotation so the cover isn't stored sideways
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ('RGB', 'RGBA'):
+                # LA/PA keep alpha in a band; P/L images may carry a transparent colour
+                has_alpha = image.mode in ('LA', 'PA') or 'transparency' in image.info
+                image = image.convert('RGBA' if has_alpha else 'RGB')
+            image.thumbnail(COVER_MAX_SIZE)
+            
+            buffer = BytesIO()
+            image.save(buffer, format='WEBP', quality=COVER_WEBP_QUALITY, method=6)
+        except (OSError, Image.DecompressionBombError):
+            return
+        
+        name = Path(self.cover_image.name).stem + '.webp'
+        self.cover_image.save(name, ContentFile(buffer.getvalue()), save=False)
+
 
 class Review(models.Model):
     """
@@ -75,7 +138,9 @@ class Review(models.Model):
     reviewer_name = models.CharField(max_length=100) 
     
     # Rating from 1 to 5 stars - defaults to 5 if not specified
-    rating = models.IntegerField(default=5)
+    # The range is enforced by the database (see Meta.constraints); the
+    # validators let forms and the API report a friendly error first
+    rating = models.IntegerField(default=5, validators=[MinValueValidator(1), MaxValueValidator(5)])
     
     # The actual review text - what the reviewer thought about the book
     body = models.TextField()
@@ -83,9 +148,39 @@ class Review(models.Model):
     # When the review was created - automatically set
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Serves "reviews for this book, newest first" from a single index
+            models.Index(fields=['book', '-created_at']),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(rating__gte=1) & models.Q(rating__lte=5),
+                name=RATING_CONSTRAINT_NAME,
+            ),
+        ]
+
     def __str__(self):
         """
         Returns a descriptive string showing who reviewed which book.
         Helpful for admin panel and debugging.
         """
-        return f"Review by {self.reviewer_name} for {self.book.title}"
\ No newline at end of file
+        return f"Review by {self.reviewer_name} for {self.book.title}"
+
+
+class QuoteEraCount(models.Model):
+    """
+    Number of quotes in each era, read from the quote_era_counts
+    materialized view that migration 0005 creates on PostgreSQL.
+    Django doesn't create or change this table (managed = False);
+    it is refreshed by refresh_quote_era_counts_task.
+    """
+    # One row per era; era is unique in the view, so it works as the key
+    era = models.CharField(max_length=50, primary_key=True)
+    
+    # How many quotes have this era
+    quote_count = models.IntegerField()
+
+    class Meta:
+        managed = False
+        db_table = 'quote_era_counts'
@@ -0,0 +1,59 @@
+"""
+Data for the quotes-per-era report.
+On PostgreSQL the counts come from the quote_era_counts materialized view
+(see migration 0005); on other databases we run the GROUP BY directly.
+Either way the result is cached, and cleared whenever quotes change.
+"""
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Count
+
+from .models import Quote, QuoteEraCount
+
+
+# Cache key for the report (cleared in signals.py when quotes change)
+QUOTE_REPORT_CACHE_KEY = 'quote_era_report'
+QUOTE_REPORT_CACHE_TIMEOUT = 60 * 5  # 5 minutes
+
+# Set while a refresh of the materialized view is queued, so a burst of
+# quote saves only triggers one refresh
+REFRESH_PENDING_CACHE_KEY = 'quote_era_counts_refresh_pending'
+
+# Wait this many seconds before refreshing, to gather up more changes
+REFRESH_DELAY = 10
+
+
+def uses_materialized_view():
+    """The materialized view only exists on PostgreSQL."""
+    return connection.vendor == 'postgresql'
+
+
+def build_quote_report():
+    """Returns [{"era": ..., "quote_count": ...}, ...], highest count first."""
+    if uses_materialized_view():
+        # Already grouped by Postgres - just read one row per era
+        report_data = QuoteEraCount.objects.values('era', 'quote_count')
+    else:
+        # Group quotes by era and count them
+        report_data = Quote.objects.values('era').annotate(quote_count=Count('id'))
+    
+    # Convert QuerySet to list so it can be cached and returned as JSON
+    return list(report_data.order_by('-quote_count'))
+
+
+def get_quote_report():
+    """The report, from the cache if we have it."""
+    return cache.get_or_set(QUOTE_REPORT_CACHE_KEY, build_quote_report, timeout=QUOTE_REPORT_CACHE_TIMEOUT)
+
+
+def refresh_quote_era_counts():
+    """
+    Recomputes the materialized view, then drops the cached report.
+    CONCURRENTLY lets the report keep reading the old counts while this runs.
+    """
+    cache.delete(REFRESH_PENDING_CACHE_KEY)
+    if uses_materialized_view():
+        with connection.cursor() as cursor:
+            cursor.execute('REFRESH MATERIALIZED VIEW CONCURRENTLY quote_era_counts')
+    cache.delete(QUOTE_REPORT_CACHE_KEY)
@@ -5,14 +5,25 @@ They also handle validation and can add computed fields.
 """
 
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 from .models import Quote, Book, Review
 
 
 class QuoteSerializer(serializers.ModelSerializer):
     """
-    Serializer for Quote model.
-    Handles converting quotes to/from JSON format for API responses.
-    Includes all fields from the Quote model.
+    Serializer for Quote model, used for the quote list.
+    Leaves out the author biography, which can be long and isn't
+    needed when showing many quotes at once.
+    """
+    class Meta:
+        model = Quote
+        fields = ['id', 'text', 'author', 'era', 'date_created']
+
+
+class QuoteDetailSerializer(serializers.ModelSerializer):
+    """
+    Serializer for a single quote.
+    Includes all fields from the Quote model, including the author biography.
     """
     class Meta:
         model = Quote
@@ -35,6 +46,60 @@ class ReviewSerializer(serializers.ModelSerializer):
         # the frontend sends the book ID, and we need to link the review to that book
 
 
+def absolute_media_url(context, url):
+    """
+    Turns a media path like /media/book_covers/image.jpg into a full URL
+    like http://localhost:8000/media/book_covers/image.jpg
+    
+    "scheme://host" is worked out once and kept in the serializer context,
+    which is shared by every book in a list - much cheaper than calling
+    request.build_absolute_uri for each one.
+    If MEDIA_URL is already absolute or protocol-relative (e.g. a CDN at
+    //cdn.example.com/), the URL is returned as-is.
+    """
+    if not url.startswith('/') or url.startswith('//'):
+        # Storage already gave us a full URL
+        return url
+    if 'host_url' not in context:
+        request = context.get('request')
+        context['host_url'] = f"{request.scheme}://{request.get_host()}" if request else None
+    if context['host_url']:
+        # Add the domain and port in front of the path
+        return context['host_url'] + url
+    # Fallback to relative URL if no request context
+    return url
+
+
+def cover_image_url(context, image):
+    """
+    Full URL for a book's cover image, or None if it has none.
+    We test image.name (a plain string) rather than the file itself, so no
+    storage backend is ever asked whether the file exists. Each URL is
+    worked out once per response and reused, since both cover_image and
+    cover_image_url need it for every book.
+    """
+    if not image or not image.name:
+        return None  # No image uploaded
+    urls = context.setdefault('cover_image_urls', {})
+    if image.name not in urls:
+        urls[image.name] = absolute_media_url(context, image.url)
+    return urls[image.name]
+
+
+class CoverImageField(serializers.ImageField):
+    """
+    ImageField that returns its URL via absolute_media_url instead of
+    DRF's default per-row request.build_absolute_uri call.
+    Uploads and validation work exactly like a normal ImageField.
+    """
+    def to_representation(self, value):
+        if not value or not value.name:
+            return None
+        if not getattr(self, 'use_url', api_settings.UPLOADED_FILES_USE_URL):
+            return value.name
+        return cover_image_url(self.context, value)
+
+
 class BookSerializer(serializers.ModelSerializer):
     """
     Serializer for Book model.
@@ -44,6 +109,9 @@ class BookSerializer(serializers.ModelSerializer):
     # This is read-only - you can't create reviews through this field
     reviews = ReviewSerializer(many=True, read_only=True) 
     
+    # The uploaded cover image (returned as a full URL)
+    cover_image = CoverImageField(required=False, allow_null=True)
+    
     # Computed field that returns the full URL to the book cover image
     # This is helpful for the frontend - it gets the complete URL ready to use
     cover_image_url = serializers.SerializerMethodField()
@@ -59,11 +127,4 @@ class BookSerializer(serializers.ModelSerializer):
         an absolute URL like: http://localhost:8000/media/book_covers/image.jpg
         Otherwise, it just returns the relative path.
         """
-        if obj.cover_image:
-            request = self.context.get('request')
-            if request:
-                # Build full URL including domain and port
-                return request.build_absolute_uri(obj.cover_image.url)
-            # Fallback to relative URL if no request context
-            return obj.cover_image.url
-        return None  # No image uploaded
\ No newline at end of file
+        return cover_image_url(self.context, obj.cover_image)
@@ -0,0 +1,86 @@
+"""
+Signal handlers for the quotes app.
+These keep cached data in sync when quotes are added, changed, or removed.
+"""
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Quote
+from .reports import (
+    QUOTE_REPORT_CACHE_KEY, REFRESH_DELAY, REFRESH_PENDING_CACHE_KEY, uses_materialized_view,
+)
+from .serializers import QuoteSerializer
+from .tasks import refresh_quote_era_counts_task
+
+
+# When any quote last changed; the quote list's ETag and Last-Modified come from it.
+# Without Redis each worker has its own LocMemCache and never sees another
+# worker's bump, so the stamp expires like the era report does: a stale
+# worker can't keep answering 304 for more than a few minutes.
+QUOTE_LIST_VERSION_CACHE_KEY = 'quote_list_version'
+QUOTE_LIST_VERSION_CACHE_TIMEOUT = 60 * 5  # 5 minutes
+
+# Columns the quote list returns; saves limited to other fields don't change it
+QUOTE_LIST_FIELDS = frozenset(QuoteSerializer.Meta.fields)
+
+
+def quote_list_version():
+    """
+    When the quote list last changed - a single cache read.
+    If the key is missing (cold, evicted or expired cache) it starts again
+    from now, which only costs clients one full response.
+    """
+    return cache.get_or_set(QUOTE_LIST_VERSION_CACHE_KEY, timezone.now, timeout=QUOTE_LIST_VERSION_CACHE_TIMEOUT)
+
+
+def quote_list_changed():
+    """
+    Call this after quotes are added, edited, or removed.
+    The new version is stored once the transaction commits, so a client
+    can never be handed the old rows under the new ETag.
+    """
+    transaction.on_commit(
+        lambda: cache.set(QUOTE_LIST_VERSION_CACHE_KEY, timezone.now(), timeout=QUOTE_LIST_VERSION_CACHE_TIMEOUT)
+    )
+
+
+def quote_counts_changed():
+    """
+    Call this after quotes are added or removed.
+    Once the current transaction commits, drops the cached report and, on
+    PostgreSQL, queues a refresh of the materialized view. Dropping it any
+    earlier would let a concurrent request re-cache the old counts.
+    """
+    transaction.on_commit(lambda: cache.delete(QUOTE_REPORT_CACHE_KEY))
+    # cache.add only succeeds if no refresh is already waiting
+    if uses_materialized_view() and cache.add(REFRESH_PENDING_CACHE_KEY, True, timeout=REFRESH_DELAY * 6):
+        transaction.on_commit(
+            lambda: refresh_quote_era_counts_task.apply_async(countdown=REFRESH_DELAY)
+        )
+
+
+@receiver([post_save, post_delete], sender=Quote)
+def bump_quote_list_version(sender, created=False, update_fields=None, **kwargs):
+    """
+    A new, deleted, or edited quote makes cached copies of the quote list stale.
+    Saves limited to fields the list doesn't show (like a bio fetch) leave it alone.
+    """
+    if not created and update_fields is not None and not QUOTE_LIST_FIELDS.intersection(update_fields):
+        return
+    quote_list_changed()
+
+
+@receiver([post_save, post_delete], sender=Quote)
+def clear_quote_report_cache(sender, created=False, update_fields=None, **kwargs):
+    """
+    Adding, deleting, or re-classifying a quote changes the per-era counts,
+    so drop the cached report and let the next request rebuild it.
+    Saves limited to other fields (like a bio fetch) leave it alone.
+    """
+    if not created and update_fields is not None and 'era' not in update_fields:
+        return
+    quote_counts_changed()
@@ -0,0 +1,100 @@
+"""
+Background tasks for the quotes app.
+These run in a Celery worker instead of the web request.
+"""
+
+from celery import Task, shared_task
+from django.core.cache import cache
+
+from .models import Quote
+from .reports import refresh_quote_era_counts
+from .wikipedia import BioNotFound, fetch_wikipedia_bio, fetch_wikipedia_bios
+
+
+# How a bio fetch ended, so the frontend knows when to stop polling
+BIO_STATUS_PENDING = 'pending'
+BIO_STATUS_DONE = 'done'
+BIO_STATUS_NOT_FOUND = 'not_found'
+BIO_STATUS_FAILED = 'failed'
+BIO_STATUS_TIMEOUT = 3600  # 1 hour - long enough for any client still polling
+
+
+def bio_status_key(quote_id):
+    return f'bio_status:{quote_id}'
+
+
+def set_bio_status(quote_ids, bio_status):
+    """Records the bio fetch status for each of the given quotes."""
+    cache.set_many({bio_status_key(quote_id): bio_status for quote_id in quote_ids}, timeout=BIO_STATUS_TIMEOUT)
+
+
+def get_bio_status(quote_id):
+    """The quote's latest bio fetch status, or None if none was started recently."""
+    return cache.get(bio_status_key(quote_id))
+
+
+class BioFetchTask(Task):
+    """
+    Base class for the bio tasks.
+    When a task fails (Wikipedia still unreachable after WIKI_SESSION's own
+    retries, or an unexpected error), its quotes are marked as failed
+    instead of staying pending forever.
+    """
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        quote_ids = args[0] if isinstance(args[0], list) else [args[0]]
+        set_bio_status(quote_ids, BIO_STATUS_FAILED)
+
+
+# No Celery retries on top of WIKI_SESSION's: stacked, they multiplied into
+# a dozen calls per fetch, all run inline when tasks are eager
+@shared_task(base=BioFetchTask)
+def fetch_bio_task(quote_id):
+    """
+    Fetches the author's bio from Wikipedia and saves it on the quote.
+    If the quote was deleted or Wikipedia has no summary, the bio status
+    is set to not_found so the frontend can stop polling.
+    """
+    try:
+        quote = Quote.objects.get(pk=quote_id)
+    except Quote.DoesNotExist:
+        set_bio_status([quote_id], BIO_STATUS_NOT_FOUND)
+        return
+    
+    try:
+        summary = fetch_wikipedia_bio(quote.author)
+    except BioNotFound:
+        set_bio_status([quote_id], BIO_STATUS_NOT_FOUND)
+        return
+    
+    quote.author_bio_summary = summary
+    quote.save(update_fields=['author_bio_summary'])
+    set_bio_status([quote_id], BIO_STATUS_DONE)
+
+
+@shared_task(base=BioFetchTask)
+def fetch_bios_bulk_task(quote_ids):
+    """
+    Fetches bios for many quotes at once.
+    Each distinct author is looked up only once, and Wikipedia is asked
+    about several authors per request. All quotes are then saved together.
+    """
+    quotes = list(Quote.objects.filter(pk__in=quote_ids).only('id', 'author'))
+    bios = fetch_wikipedia_bios([quote.author for quote in quotes])
+    
+    updated = []
+    for quote in quotes:
+        if quote.author in bios:
+            quote.author_bio_summary = bios[quote.author]
+            updated.append(quote)
+    
+    Quote.objects.bulk_update(updated, ['author_bio_summary'], batch_size=500)
+    
+    found = {quote.id for quote in updated}
+    set_bio_status(found, BIO_STATUS_DONE)
+    set_bio_status(set(quote_ids) - found, BIO_STATUS_NOT_FOUND)
+
+
+@shared_task
+def refresh_quote_era_counts_task():
+    """Refreshes the quote_era_counts materialized view (PostgreSQL only)."""
+    refresh_quote_era_counts()
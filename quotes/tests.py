@@ -1,3 +1,332 @@
-from django.test import TestCase
+"""
+Tests for the quotes app.
+Wikipedia is never called for real - WIKI_SESSION.get is mocked.
+"""
 
-# Create your tests here.
+import csv
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+import requests
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from PIL import Image
+
+from . import wikipedia
+from .models import Quote, Book, Review
+from .reports import QUOTE_REPORT_CACHE_KEY, get_quote_report
+from .serializers import absolute_media_url
+from .views import LIST_REVIEWS_PER_BOOK
+
+
+def wikipedia_response(query):
+    """A fake requests.Response carrying Wikipedia's {"query": ...} JSON."""
+    response = mock.Mock()
+    response.json.return_value = {"query": query}
+    return response
+
+
+class FetchWikipediaBiosTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_follows_normalized_then_redirected_title(self):
+        query = {
+            "normalized": [{"from": "john keats", "to": "John keats"}],
+            "redirects": [{"from": "John keats", "to": "John Keats"}],
+            "pages": {
+                "1": {"pageid": 1, "title": "John Keats", "extract": "English poet."},
+                "-1": {"title": "Nobody Atall", "missing": ""},
+            },
+        }
+        with mock.patch.object(wikipedia.WIKI_SESSION, 'get', return_value=wikipedia_response(query)) as get:
+            bios = wikipedia.fetch_wikipedia_bios(["john keats", "Nobody Atall", "john keats"])
+
+        self.assertEqual(bios, {"john keats": "English poet."})
+        # Both authors went out in a single request
+        get.assert_called_once()
+        self.assertEqual(get.call_args.kwargs['params']['titles'], "john keats|Nobody Atall")
+
+    def test_cached_bios_skip_wikipedia(self):
+        cache.set(wikipedia.bio_cache_key("John Keats"), "English poet.")
+        with mock.patch.object(wikipedia.WIKI_SESSION, 'get') as get:
+            bios = wikipedia.fetch_wikipedia_bios(["John Keats"])
+
+        self.assertEqual(bios, {"John Keats": "English poet."})
+        get.assert_not_called()
+
+
+class FetchBioApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.quote = Quote.objects.create(text="A thing of beauty is a joy for ever", author="Nobody Atall")
+
+    def test_bulk_rejects_a_bare_list(self):
+        response = self.client.post(
+            reverse('quote-fetch-bios-bulk'), [self.quote.id], content_type='application/json'
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_template_fetch_bio_queues_the_task(self):
+        with mock.patch('quotes.views.fetch_bio_task') as task:
+            response = self.client.post(reverse('quote_fetch_bio', args=[self.quote.id]), follow=True)
+
+        task.delay.assert_called_once_with(self.quote.id)
+        self.assertRedirects(response, reverse('quote_detail', args=[self.quote.id]))
+        self.assertContains(response, "Fetching bio for Nobody Atall")
+
+    def test_missing_bio_ends_with_not_found_status(self):
+        query = {"pages": {"-1": {"title": "Nobody Atall", "missing": ""}}}
+        with mock.patch.object(wikipedia.WIKI_SESSION, 'get', return_value=wikipedia_response(query)):
+            response = self.client.post(reverse('quote-fetch-author-bio', args=[self.quote.id]))
+        self.assertEqual(response.status_code, 202)
+
+        response = self.client.get(reverse('quote-detail', args=[self.quote.id]))
+        self.assertEqual(response.json()['bio_status'], 'not_found')
+        self.assertIsNone(response.json()['author_bio_summary'])
+
+    def test_network_failure_is_tried_once_and_marked_failed(self):
+        with mock.patch.object(wikipedia.WIKI_SESSION, 'get', side_effect=requests.ConnectionError) as get:
+            response = self.client.post(reverse('quote-fetch-author-bio', args=[self.quote.id]))
+        self.assertEqual(response.status_code, 202)
+        # Retries are left to WIKI_SESSION's adapter, not repeated by Celery
+        get.assert_called_once()
+
+        response = self.client.get(reverse('quote-detail', args=[self.quote.id]))
+        self.assertEqual(response.json()['bio_status'], 'failed')
+
+
+class QuoteListConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.quote = Quote.objects.create(text="Beauty is truth", author="John Keats")
+
+    def test_unchanged_list_returns_304(self):
+        url = reverse('quote-list')
+        etag = self.client.get(url)['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_edit_changes_the_etag(self):
+        url = reverse('quote-list')
+        etag = self.client.get(url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.quote.text = "Truth beauty"
+            self.quote.save()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_bio_save_keeps_the_etag(self):
+        url = reverse('quote-list')
+        etag = self.client.get(url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.quote.author_bio_summary = "English poet."
+            self.quote.save(update_fields=['author_bio_summary'])
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_etag_depends_on_accept_header(self):
+        url = reverse('quote-list')
+        etag = self.client.get(url, HTTP_ACCEPT='application/json')['ETag']
+
+        response = self.client.get(url, HTTP_ACCEPT='text/html', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+class QuoteExportTests(TestCase):
+    def test_export_streams_every_quote_as_csv(self):
+        Quote.objects.create(text="Beauty is truth, truth beauty", author="John Keats", era="Romantic")
+        Quote.objects.create(text="Do not go gentle", author="Dylan Thomas")
+
+        response = self.client.get(reverse('quote-export-csv'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+
+        rows = list(csv.reader(b''.join(response.streaming_content).decode().splitlines()))
+        self.assertEqual(rows[0], ['id', 'text', 'author', 'era', 'author_bio_summary', 'date_created'])
+        self.assertEqual([row[1] for row in rows[1:]], ["Beauty is truth, truth beauty", "Do not go gentle"])
+
+
+class QuoteReportCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        Quote.objects.create(text="Beauty is truth", author="John Keats", era="Romantic")
+
+    def test_report_is_dropped_only_after_commit(self):
+        get_quote_report()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Quote.objects.create(text="Do not go gentle", author="Dylan Thomas", era="Modern")
+            # Still in the transaction - the report must not be rebuilt from uncommitted rows yet
+            self.assertIsNotNone(cache.get(QUOTE_REPORT_CACHE_KEY))
+
+        self.assertIsNone(cache.get(QUOTE_REPORT_CACHE_KEY))
+        self.assertEqual({row['era'] for row in get_quote_report()}, {"Romantic", "Modern"})
+
+    def test_bio_save_keeps_the_report(self):
+        quote = Quote.objects.get()
+        get_quote_report()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            quote.author_bio_summary = "English poet."
+            quote.save(update_fields=['author_bio_summary'])
+
+        self.assertIsNotNone(cache.get(QUOTE_REPORT_CACHE_KEY))
+
+
+class QuoteBulkCreateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def test_bulk_create_refreshes_report_and_list(self):
+        list_url = reverse('quote-list')
+        etag = self.client.get(list_url)['ETag']
+        get_quote_report()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('quote-bulk'),
+                [{'text': "Beauty is truth", 'author': "John Keats", 'era': "Romantic"}] * 3,
+                content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Quote.objects.count(), 3)
+
+        self.assertIsNone(cache.get(QUOTE_REPORT_CACHE_KEY))
+        self.assertEqual(get_quote_report(), [{'era': "Romantic", 'quote_count': 3}])
+        self.assertEqual(self.client.get(list_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_bulk_create_is_all_or_nothing(self):
+        response = self.client.post(
+            reverse('quote-bulk'),
+            [{'text': "Beauty is truth", 'author': "John Keats"}, {'text': "No author"}],
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Quote.objects.exists())
+
+
+class BookListTests(TestCase):
+    def setUp(self):
+        for title in ("Endymion", "Lamia", "Poems"):
+            book = Book.objects.create(title=title, author="John Keats")
+            for n in range(3):
+                Review.objects.create(book=book, reviewer_name=f"Reader {n}", rating=4, body="Lovely")
+
+    def test_list_loads_reviews_in_one_extra_query(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('book-list'))
+        books = response.json()['results']
+        self.assertEqual([book['title'] for book in books], ["Endymion", "Lamia", "Poems"])
+        self.assertTrue(all(len(book['reviews']) == 3 for book in books))
+
+    def test_list_keeps_only_the_newest_reviews_per_book(self):
+        book = Book.objects.get(title="Lamia")
+        for n in range(3, 12):
+            Review.objects.create(book=book, reviewer_name=f"Reader {n}", rating=4, body="Lovely")
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('book-list'))
+        lamia = next(item for item in response.json()['results'] if item['title'] == "Lamia")
+        self.assertEqual(len(lamia['reviews']), LIST_REVIEWS_PER_BOOK)
+        self.assertEqual(lamia['reviews'][0]['reviewer_name'], "Reader 11")
+
+        # The book's own page still has all of them
+        response = self.client.get(reverse('book-detail', args=[book.id]))
+        self.assertEqual(len(response.json()['reviews']), 12)
+
+
+class BookCoverTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        self.enterContext(override_settings(MEDIA_ROOT=media_root))
+
+    def upload(self, mode, size=(1600, 1200)):
+        buffer = BytesIO()
+        Image.new(mode, size).save(buffer, format='PNG')
+        return SimpleUploadedFile('cover.png', buffer.getvalue(), content_type='image/png')
+
+    def test_cover_is_shrunk_and_stored_as_webp(self):
+        book = Book.objects.create(title="Endymion", author="John Keats", cover_image=self.upload('RGB'))
+
+        self.assertTrue(book.cover_image.name.endswith('.webp'))
+        with Image.open(book.cover_image.path) as image:
+            self.assertEqual(image.format, 'WEBP')
+            self.assertEqual(image.size, (800, 600))
+
+    def test_transparent_cover_keeps_its_alpha(self):
+        book = Book.objects.create(title="Lamia", author="John Keats", cover_image=self.upload('LA', (100, 100)))
+
+        with Image.open(book.cover_image.path) as image:
+            self.assertEqual(image.mode, 'RGBA')
+
+
+class MediaUrlTests(TestCase):
+    def setUp(self):
+        self.context = {'request': RequestFactory().get('/')}
+
+    def test_local_path_gets_the_host(self):
+        self.assertEqual(
+            absolute_media_url(self.context, '/media/book_covers/a.webp'),
+            'http://testserver/media/book_covers/a.webp',
+        )
+
+    def test_cdn_urls_are_left_alone(self):
+        for url in ('https://cdn.example.com/a.webp', '//cdn.example.com/a.webp'):
+            self.assertEqual(absolute_media_url(self.context, url), url)
+
+
+class ReviewRatingTests(TestCase):
+    def setUp(self):
+        self.book = Book.objects.create(title="Endymion", author="John Keats")
+
+    def messages(self, response):
+        return [str(message) for message in response.context['messages']]
+
+    def test_create_rejects_out_of_range_rating(self):
+        response = self.client.post(
+            reverse('review_create', args=[self.book.id]),
+            {'reviewer_name': "Fanny", 'rating': '9', 'body': "Lovely"},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Rating must be between 1 and 5.", self.messages(response))
+        self.assertFalse(Review.objects.exists())
+
+    def test_create_rejects_non_numeric_rating(self):
+        response = self.client.post(
+            reverse('review_create', args=[self.book.id]),
+            {'reviewer_name': "Fanny", 'rating': 'five', 'body': "Lovely"},
+        )
+        self.assertIn("Invalid rating value.", self.messages(response))
+
+    def test_edit_rejects_out_of_range_rating(self):
+        review = Review.objects.create(book=self.book, reviewer_name="Fanny", rating=4, body="Lovely")
+        response = self.client.post(
+            reverse('review_edit', args=[review.id]),
+            {'reviewer_name': "Fanny", 'rating': '0', 'body': "Lovely"},
+        )
+        self.assertIn("Rating must be between 1 and 5.", self.messages(response))
+        review.refresh_from_db()
+        self.assertEqual(review.rating, 4)
+
+    def test_edit_saves_valid_rating(self):
+        review = Review.objects.create(book=self.book, reviewer_name="Fanny", rating=4, body="Lovely")
+        response = self.client.post(
+            reverse('review_edit', args=[review.id]),
+            {'reviewer_name': "Fanny", 'rating': '2', 'body': "Changed my mind"},
+        )
+        self.assertRedirects(response, reverse('book_detail', args=[self.book.id]))
+        review.refresh_from_db()
+        self.assertEqual(review.rating, 2)
@@ -5,34 +5,159 @@ and custom actions like fetching Wikipedia data.
 """
 
 from django.shortcuts import render, redirect, get_object_or_404
-from django.db.models import Count 
+from django.http import StreamingHttpResponse
+from django.core.paginator import Paginator
+from django.db import IntegrityError, transaction
+from django.db.models import F, Prefetch, Window
+from django.db.models.functions import RowNumber
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
 from django.contrib import messages
-import requests
+import csv
+import hashlib
+import itertools
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.pagination import CursorPagination
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django_auto_prefetching import AutoPrefetchViewSetMixin
 
 # Import our models and serializers
-from .models import Quote, Book, Review 
-from .serializers import QuoteSerializer, BookSerializer, ReviewSerializer
+from .models import Quote, Book, Review, RATING_CONSTRAINT_NAME
+from .serializers import QuoteSerializer, QuoteDetailSerializer, BookSerializer, ReviewSerializer
+from .reports import get_quote_report
+from .signals import quote_counts_changed, quote_list_changed, quote_list_version
+from .tasks import BIO_STATUS_PENDING, fetch_bio_task, fetch_bios_bulk_task, get_bio_status, set_bio_status
 
 
-# Wikipedia API endpoint - we'll use this to fetch author biographies
-WIKIPEDIA_API_URL = "https://en.wikipedia.org/w/api.php"
+# How many items the HTML list pages show at once
+TEMPLATE_PAGE_SIZE = 20
+
+# Reviews shown per page on a book's page, and nested under each book in the API book list
+REVIEWS_PAGE_SIZE = 10
+LIST_REVIEWS_PER_BOOK = 10
+
+# Most quote ids accepted by one fetch-bios-bulk call
+MAX_BULK_IDS = 500
+
+# How many rows the CSV export reads from the database at a time
+EXPORT_CHUNK_SIZE = 2000
+
+# Most objects accepted by one bulk create call, and how many rows go in each INSERT
+MAX_BULK_CREATE = 5000
+BULK_CREATE_BATCH_SIZE = 1000
+
+
+# =========================================================
+# 0. PAGINATION AND BULK CREATE (shared by the ViewSets)
+# =========================================================
+# CursorPagination needs to know which field to order by.
+# Each model has its own natural ordering, so we give each ViewSet its own class.
+
+class QuoteCursorPagination(CursorPagination):
+    """
+    Newest quotes first. The cursor holds the last date_created seen, so the
+    next page is a "WHERE date_created < ..." seek rather than an OFFSET scan.
+    DRF only filters on that first field: quotes sharing the boundary
+    date_created are skipped with a small offset kept in the cursor.
+    id makes that order stable, and the (date_created, id) index serves
+    the whole ORDER BY.
+    """
+    ordering = ('-date_created', '-id')
+    cursor_query_param = 'cursor'
+
+
+class BookCursorPagination(CursorPagination):
+    """Books alphabetically by title."""
+    ordering = 'title'
+
+
+class ReviewCursorPagination(CursorPagination):
+    """Newest reviews first."""
+    ordering = '-created_at'
+
+
+class BulkCreateMixin:
+    """
+    Adds a POST {prefix}/bulk/ endpoint to a ViewSet.
+    It takes a JSON list of objects and inserts them with bulk_create,
+    a few big INSERTs instead of one INSERT per object. Useful for
+    importers and scripts that load lots of data at once.
+    """
+    @action(detail=False, methods=['post'], url_path='bulk')
+    def bulk(self, request):
+        """
+        POST /api/{prefix}/bulk/ with a list like [{...}, {...}]
+        Everything is validated first; if any item is invalid, nothing is saved.
+        """
+        if not isinstance(request.data, list) or not request.data:
+            return Response({"error": "Send a non-empty JSON list."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(request.data) > MAX_BULK_CREATE:
+            return Response({"error": f"At most {MAX_BULK_CREATE} items per request."}, status=status.HTTP_400_BAD_REQUEST)
+        
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        objects = self.perform_bulk_create(serializer)
+        
+        return Response(self.get_serializer(objects, many=True).data, status=status.HTTP_201_CREATED)
+    
+    def perform_bulk_create(self, serializer):
+        """Builds the model objects and saves them all in one transaction."""
+        model = self.get_queryset().model
+        objects = [model(**item) for item in serializer.validated_data]
+        with transaction.atomic():
+            return model.objects.bulk_create(objects, batch_size=BULK_CREATE_BATCH_SIZE)
+
+
+class EchoBuffer:
+    """
+    A fake file for csv.writer: write() just returns the line
+    instead of storing it, so each row can be streamed straight out.
+    """
+    def write(self, value):
+        return value
 
 
 # =========================================================
 # 1. QUOTE CRUD VIEW SET
 # =========================================================
 
-class QuoteViewSet(viewsets.ModelViewSet):
+def quote_list_state(request):
+    """
+    When any quote last changed, read from the cache (see signals.quote_list_version)
+    instead of scanning the quote table.
+    Saved on the request so the ETag and Last-Modified checks share one lookup.
+    """
+    if not hasattr(request, '_quote_list_state'):
+        request._quote_list_state = quote_list_version()
+    return request._quote_list_state
+
+
+def quote_list_last_modified(request, *args, **kwargs):
+    """Last-Modified for GET /api/quotes/ - when any quote last changed."""
+    return quote_list_state(request)
+
+
+def quote_list_etag(request, *args, **kwargs):
+    """
+    ETag for GET /api/quotes/.
+    Built from the list version plus the query string (which page) and the
+    Accept header (JSON vs browsable API), since those change the response too.
+    """
+    raw = f"{quote_list_state(request).isoformat()}:{request.GET.urlencode()}:{request.META.get('HTTP_ACCEPT', '')}"
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+class QuoteViewSet(BulkCreateMixin, viewsets.ModelViewSet):
     """
     Handles all CRUD operations for quotes.
     Django REST Framework automatically creates endpoints for:
     - GET /api/quotes/ (list all quotes)
     - POST /api/quotes/ (create new quote)
+    - POST /api/quotes/bulk/ (create many quotes at once)
+    - GET /api/quotes/export/ (download all quotes as CSV)
     - GET /api/quotes/{id}/ (get specific quote)
     - PUT /api/quotes/{id}/ (update quote)
     - DELETE /api/quotes/{id}/ (delete quote)
@@ -42,6 +167,59 @@ class QuoteViewSet(viewsets.ModelViewSet):
     
     # Serializer handles converting between Python objects and JSON
     serializer_class = QuoteSerializer
+    
+    # Return quotes in pages of PAGE_SIZE, newest first
+    pagination_class = QuoteCursorPagination
+    
+    @method_decorator(condition(etag_func=quote_list_etag, last_modified_func=quote_list_last_modified))
+    def list(self, request, *args, **kwargs):
+        """
+        GET /api/quotes/ with conditional GET support.
+        If the client sends back the ETag (If-None-Match) or date (If-Modified-Since)
+        from its last response and nothing has changed, we reply 304 Not Modified
+        with no body instead of serializing the page again.
+        """
+        return super().list(request, *args, **kwargs)
+    
+    def get_queryset(self):
+        """
+        For the list, only load the columns QuoteSerializer returns.
+        The author biography can be long, so we skip it unless a single
+        quote is requested.
+        """
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            queryset = queryset.only('id', 'text', 'author', 'era', 'date_created')
+        return queryset
+    
+    def get_serializer_class(self):
+        """
+        Use the slim serializer for the list and the full one
+        (with the author biography) everywhere else.
+        """
+        if self.action == 'list':
+            return QuoteSerializer
+        return QuoteDetailSerializer
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        A single quote, plus bio_status: how the latest fetch-bio for it
+        went (pending, done, not_found or failed), or null if none was
+        started in the last hour.
+        """
+        response = super().retrieve(request, *args, **kwargs)
+        response.data['bio_status'] = get_bio_status(response.data['id'])
+        return response
+
+    def perform_bulk_create(self, serializer):
+        """
+        bulk_create doesn't send post_save signals,
+        so update the era report and the list version ourselves.
+        """
+        quotes = super().perform_bulk_create(serializer)
+        quote_counts_changed()
+        quote_list_changed()
+        return quotes
 
     @action(detail=True, methods=['post'], url_path='fetch-bio')
     def fetch_author_bio(self, request, pk=None):
@@ -49,86 +227,77 @@ class QuoteViewSet(viewsets.ModelViewSet):
         Custom action to fetch author biography from Wikipedia.
         This is called via POST /api/quotes/{id}/fetch-bio/
         
-        It's a cool feature - when you have a quote, you can fetch
-        the author's bio from Wikipedia and save it to the database.
+        Calling Wikipedia can take a few seconds, so we hand the work to a
+        background task and answer straight away with 202 Accepted.
+        The frontend then polls GET /api/quotes/{id}/ until bio_status
+        is no longer "pending": "done" means author_bio_summary is filled
+        in, "not_found" and "failed" mean it won't be.
         """
         # First, make sure the quote exists
         try:
             quote = self.get_object()
         except Quote.DoesNotExist:
             return Response({"error": "Quote not found"}, status=status.HTTP_404_NOT_FOUND)
-
-        # Get the author's name from the quote
-        author_name = quote.author
         
-        # Prepare parameters for Wikipedia API request
-        # We're asking for a brief intro extract in plain text format
-        params = {
-            "action": "query",           # Standard Wikipedia API action
-            "format": "json",            # We want JSON response
-            "titles": author_name,       # Search for this author
-            "prop": "extracts",          # Get the article extract
-            "exintro": True,             # Just the intro section (first paragraph)
-            "explaintext": True,         # Plain text, no HTML
-            "redirects": 1               # Follow redirects if author name is slightly different
-        }
+        # Queue the Wikipedia lookup - a Celery worker will save the bio
+        set_bio_status([quote.id], BIO_STATUS_PENDING)
+        fetch_bio_task.delay(quote.id)
         
+        return Response(
+            {"message": f"Fetching bio for {quote.author}. Check back shortly.", "quote_id": quote.id},
+            status=status.HTTP_202_ACCEPTED
+        )
+    
+    @action(detail=False, methods=['post'], url_path='fetch-bios-bulk')
+    def fetch_bios_bulk(self, request):
+        """
+        Fetch author biographies for many quotes in one go.
+        This is called via POST /api/quotes/fetch-bios-bulk/
+        with a body like: {"ids": [1, 2, 3]}
+        
+        Much cheaper than calling fetch-bio for each quote - authors are
+        deduplicated and looked up in batches. Like fetch-bio, the work
+        runs in the background and we answer with 202 Accepted, and each
+        quote's bio_status shows when its lookup has finished.
+        """
+        ids = request.data.get('ids') if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or not ids:
+            return Response({"error": "Send a non-empty list of quote ids as 'ids'."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > MAX_BULK_IDS:
+            return Response({"error": f"At most {MAX_BULK_IDS} ids per request."}, status=status.HTTP_400_BAD_REQUEST)
         try:
-            # Wikipedia requires a User-Agent header to identify the application
-            headers = {
-                'User-Agent': 'PoetsCanvas/1.0 (https://github.com/yourusername/poets-canvas; contact@example.com)'
-            }
-            # Make the request to Wikipedia with a 5 second timeout
-            # We don't want to wait forever if Wikipedia is slow
-            response = requests.get(WIKIPEDIA_API_URL, params=params, headers=headers, timeout=5) 
-            response.raise_for_status()  # Raise an error if request failed
-            
-            # Parse the JSON response
-            data = response.json()
-            
-            # Check if we got any pages
-            if 'query' not in data or 'pages' not in data['query'] or not data['query']['pages']:
-                return Response(
-                    {"error": f"No Wikipedia article found for {author_name}."},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-            
-            # Wikipedia returns pages in a dict, we just need the first (and usually only) page
-            page = next(iter(data['query']['pages'].values()))
-            
-            # Check if page exists (Wikipedia returns -1 for missing pages)
-            if 'missing' in page or page.get('pageid', -1) == -1:
-                return Response(
-                    {"error": f"No Wikipedia article found for {author_name}."},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-            
-            summary = page.get('extract', 'No summary found.')
-            
-            if not summary or summary == 'No summary found.':
-                return Response(
-                    {"error": f"Wikipedia article found but no summary available for {author_name}."},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-            
-            # Save the biography to our database
-            # This way we don't have to fetch it every time
-            quote.author_bio_summary = summary
-            quote.save()
-            
-            # Return success response with the fetched bio
-            return Response(
-                {"message": f"Successfully fetched and saved bio for {author_name}.", "summary": summary},
-                status=status.HTTP_200_OK
-            )
-            
-        except requests.RequestException as e:
-            # If something went wrong (network error, timeout, etc.)
-            # Return a proper error response
-            return Response(
-                {"error": f"External API error while fetching bio: {e}"},
-                status=status.HTTP_503_SERVICE_UNAVAILABLE
-            )
+            ids = [int(quote_id) for quote_id in ids]
+        except (TypeError, ValueError):
+            return Response({"error": "Quote ids must be integers."}, status=status.HTTP_400_BAD_REQUEST)
+        
+        set_bio_status(ids, BIO_STATUS_PENDING)
+        fetch_bios_bulk_task.delay(ids)
+        
+        return Response(
+            {"message": f"Fetching bios for {len(set(ids))} quotes. Check back shortly."},
+            status=status.HTTP_202_ACCEPTED
+        )
+    
+    @action(detail=False, methods=['get'], url_path='export')
+    def export_csv(self, request):
+        """
+        Download every quote as a CSV file.
+        This is called via GET /api/quotes/export/
+        
+        The rows are streamed: we read EXPORT_CHUNK_SIZE quotes at a time
+        with .iterator() and write them out as we go, so memory use stays
+        the same no matter how many quotes there are.
+        (On PostgreSQL, .iterator() also uses a server-side cursor.)
+        """
+        fields = ['id', 'text', 'author', 'era', 'author_bio_summary', 'date_created']
+        rows = Quote.objects.order_by('id').values_list(*fields).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        
+        writer = csv.writer(EchoBuffer())
+        lines = itertools.chain([writer.writerow(fields)], (writer.writerow(row) for row in rows))
+        
+        response = StreamingHttpResponse(lines, content_type='text/csv')
+        response['Content-Disposition'] = 'attachment; filename="quotes.csv"'
+        return response
 
 
 # =========================================================
@@ -154,32 +323,54 @@ class QuoteReportView(APIView):
         
         Groups all quotes by era and counts how many quotes are in each era.
         Returns the results sorted by count (highest first).
+        The result is cached, so repeated calls don't re-run the aggregation.
+        On PostgreSQL the counts come from a materialized view (see reports.py).
         """
-        # Group quotes by era and count them
-        # This is a Django ORM aggregation - very efficient!
-        report_data = Quote.objects.values('era').annotate(
-            quote_count=Count('id')
-        ).order_by('-quote_count')  # Order by count descending
-        
-        # Convert QuerySet to list so we can return it as JSON
-        report_list = list(report_data)
-        
-        return Response(report_list, status=status.HTTP_200_OK)
+        return Response(get_quote_report(), status=status.HTTP_200_OK)
 
 
 # =========================================================
 # 3. BOOK CRUD VIEW SET
 # =========================================================
 
-class BookViewSet(viewsets.ModelViewSet):
+class BookViewSet(AutoPrefetchViewSetMixin, viewsets.ModelViewSet):
     """
     Handles all CRUD operations for books.
     Books are used when creating reviews - users can select a book
     or create a new one with a cover image.
+    
+    AutoPrefetchViewSetMixin looks at BookSerializer and adds the
+    select_related/prefetch_related calls it needs, so new related
+    fields on the serializer don't bring back N+1 queries.
     """
     # Get all books, ordered alphabetically by title
     queryset = Book.objects.all().order_by('title')
     serializer_class = BookSerializer
+    pagination_class = BookCursorPagination
+    
+    # Reviews are prefetched by hand below (to keep them newest first),
+    # so the automatic prefetching must not add them a second time
+    auto_prefetch_excluded_fields = {'reviews'}
+    
+    def get_prefetchable_queryset(self):
+        """
+        Loads every book's reviews in one extra query instead of one per book.
+        The nested ReviewSerializer reads book.reviews.all(), which is served
+        from this prefetch cache rather than hitting the database again.
+        
+        In the book list only the newest LIST_REVIEWS_PER_BOOK reviews are
+        included per book: ROW_NUMBER() numbers each book's reviews newest
+        first and we keep rows 1..N, so it's still one query for all books.
+        The full set is at GET /api/books/{id}/ or GET /api/reviews/?book_id={id}.
+        """
+        reviews = Review.objects.order_by('-created_at')
+        if self.action == 'list':
+            reviews = reviews.annotate(
+                row_number=Window(RowNumber(), partition_by=F('book'), order_by=F('created_at').desc())
+            ).filter(row_number__lte=LIST_REVIEWS_PER_BOOK)
+        return super().get_prefetchable_queryset().prefetch_related(
+            Prefetch('reviews', queryset=reviews)
+        )
     
     def get_serializer_context(self):
         """
@@ -196,23 +387,30 @@ class BookViewSet(viewsets.ModelViewSet):
 # 4. REVIEW CRUD VIEW SET
 # =========================================================
 
-class ReviewViewSet(viewsets.ModelViewSet):
+class ReviewViewSet(AutoPrefetchViewSetMixin, BulkCreateMixin, viewsets.ModelViewSet):
     """
     Handles all CRUD operations for book reviews.
     Users can create, read, update, and delete reviews.
+    Many reviews can be created at once via POST /api/reviews/bulk/.
     Reviews are ordered by creation date (newest first).
     """
     # Get all reviews, newest first
     queryset = Review.objects.all().order_by('-created_at')
     serializer_class = ReviewSerializer
+    pagination_class = ReviewCursorPagination
     
-    def get_queryset(self):
+    # ReviewSerializer only returns the book's id, which is already on the
+    # review row, so don't let the mixin JOIN in every book column
+    auto_prefetch_excluded_fields = {'book'}
+    
+    def get_prefetchable_queryset(self):
         """
         Allows filtering reviews by book_id via query parameter.
         Example: GET /api/reviews/?book_id=5
         This returns only reviews for book with ID 5.
+        (AutoPrefetchViewSetMixin then adds any prefetching ReviewSerializer needs.)
         """
-        queryset = super().get_queryset()
+        queryset = super().get_prefetchable_queryset()
         book_id = self.request.query_params.get('book_id')
         
         # If book_id is provided, filter reviews for that book
@@ -228,15 +426,19 @@ class ReviewViewSet(viewsets.ModelViewSet):
 
 def home(request):
     """Home page view showing recent quotes and navigation."""
-    recent_quotes = Quote.objects.all().order_by('-date_created')[:5]
+    # The bio isn't shown on the home page, so don't load it
+    recent_quotes = Quote.objects.defer('author_bio_summary').order_by('-date_created')[:5]
     return render(request, 'quotes/home.html', {'recent_quotes': recent_quotes})
 
 
 # Quote Template Views
 def quote_list(request):
-    """List all quotes."""
-    quotes = Quote.objects.all().order_by('-date_created')
-    return render(request, 'quotes/quote_list.html', {'quotes': quotes})
+    """List all quotes, one page at a time."""
+    # Only load the columns the list template shows (skips the long bio),
+    # as plain dicts - the template reads quote.text the same way on a dict
+    quotes = Quote.objects.values('id', 'text', 'author', 'era').order_by('-date_created', '-id')
+    page_obj = Paginator(quotes, TEMPLATE_PAGE_SIZE).get_page(request.GET.get('page'))
+    return render(request, 'quotes/quote_list.html', {'quotes': page_obj, 'page_obj': page_obj})
 
 
 def quote_detail(request, pk):
@@ -267,10 +469,15 @@ def quote_edit(request, pk):
     quote = get_object_or_404(Quote, pk=pk)
     
     if request.method == 'POST':
+        old_era = quote.era
         quote.text = request.POST.get('text')
         quote.author = request.POST.get('author')
         quote.era = request.POST.get('era', '') or None
-        quote.save()
+        # Only list era when it changed, so the era report isn't rebuilt for nothing
+        fields = ['text', 'author']
+        if quote.era != old_era:
+            fields.append('era')
+        quote.save(update_fields=fields)
         messages.success(request, 'Quote updated successfully!')
         return redirect('quote_detail', pk=quote.id)
     
@@ -288,70 +495,36 @@ def quote_delete(request, pk):
 
 
 def quote_fetch_bio(request, pk):
-    """Fetch author bio from Wikipedia for a quote."""
+    """
+    Fetch author bio from Wikipedia for a quote.
+    Like the API's fetch-bio action, the lookup runs in a background task,
+    so this request doesn't hold up a worker while Wikipedia answers.
+    """
     quote = get_object_or_404(Quote, pk=pk)
     
     if request.method == 'POST':
-        author_name = quote.author
-        
-        params = {
-            "action": "query",
-            "format": "json",
-            "titles": author_name,
-            "prop": "extracts",
-            "exintro": True,
-            "explaintext": True,
-            "redirects": 1
-        }
-        
-        try:
-            # Wikipedia requires a User-Agent header to identify the application
-            headers = {
-                'User-Agent': 'PoetsCanvas/1.0 (https://github.com/yourusername/poets-canvas; contact@example.com)'
-            }
-            response = requests.get(WIKIPEDIA_API_URL, params=params, headers=headers, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-            
-            # Check if we got any pages
-            if 'query' not in data or 'pages' not in data['query'] or not data['query']['pages']:
-                messages.error(request, f'No Wikipedia article found for {author_name}.')
-                return redirect('quote_detail', pk=pk)
-            
-            page = next(iter(data['query']['pages'].values()))
-            
-            # Check if page exists (Wikipedia returns -1 for missing pages)
-            if 'missing' in page or page.get('pageid', -1) == -1:
-                messages.error(request, f'No Wikipedia article found for {author_name}.')
-                return redirect('quote_detail', pk=pk)
-            
-            summary = page.get('extract', 'No summary found.')
-            
-            if not summary or summary == 'No summary found.':
-                messages.error(request, f'Wikipedia article found but no summary available for {author_name}.')
-                return redirect('quote_detail', pk=pk)
-            
-            quote.author_bio_summary = summary
-            quote.save()
-            messages.success(request, f'Successfully fetched bio for {author_name}!')
-        except requests.RequestException as e:
-            messages.error(request, f'Error fetching bio: {str(e)}')
+        set_bio_status([quote.id], BIO_STATUS_PENDING)
+        fetch_bio_task.delay(quote.id)
+        messages.info(request, f'Fetching bio for {quote.author}. Refresh the page shortly to see it.')
     
     return redirect('quote_detail', pk=pk)
 
 
 # Book Template Views
 def book_list(request):
-    """List all books."""
-    books = Book.objects.all().order_by('title')
-    return render(request, 'quotes/book_list.html', {'books': books})
+    """List all books, one page at a time."""
+    books = Book.objects.only('id', 'title', 'author', 'cover_image').order_by('title')
+    page_obj = Paginator(books, TEMPLATE_PAGE_SIZE).get_page(request.GET.get('page'))
+    return render(request, 'quotes/book_list.html', {'books': page_obj, 'page_obj': page_obj})
 
 
 def book_detail(request, pk):
-    """Show details of a specific book with its reviews."""
+    """Show details of a specific book with its reviews, newest first, one page at a time."""
     book = get_object_or_404(Book, pk=pk)
-    reviews = book.reviews.all().order_by('-created_at')
-    return render(request, 'quotes/book_detail.html', {'book': book, 'reviews': reviews})
+    # Only the reviews shown on this page are loaded (plus one COUNT for the total)
+    reviews = book.reviews.order_by('-created_at')
+    page_obj = Paginator(reviews, REVIEWS_PAGE_SIZE).get_page(request.GET.get('page'))
+    return render(request, 'quotes/book_detail.html', {'book': book, 'reviews': page_obj, 'page_obj': page_obj})
 
 
 def book_create(request):
@@ -404,6 +577,11 @@ def book_delete(request, pk):
 
 
 # Review Template Views
+def is_rating_out_of_range(error):
+    """True if an IntegrityError came from the rating 1-5 check constraint."""
+    return RATING_CONSTRAINT_NAME in str(error)
+
+
 def review_create(request, book_id):
     """Create a new review for a book."""
     book = get_object_or_404(Book, pk=book_id)
@@ -414,21 +592,23 @@ def review_create(request, book_id):
         body = request.POST.get('body')
         
         if reviewer_name and rating and body:
+            # The database checks the 1-5 range (Review.Meta.constraints)
             try:
-                rating = int(rating)
-                if 1 <= rating <= 5:
-                    review = Review.objects.create(
+                with transaction.atomic():
+                    Review.objects.create(
                         book=book,
                         reviewer_name=reviewer_name,
-                        rating=rating,
+                        rating=int(rating),
                         body=body
                     )
-                    messages.success(request, 'Review created successfully!')
-                    return redirect('book_detail', pk=book.id)
-                else:
-                    messages.error(request, 'Rating must be between 1 and 5.')
+                messages.success(request, 'Review created successfully!')
+                return redirect('book_detail', pk=book.id)
             except ValueError:
                 messages.error(request, 'Invalid rating value.')
+            except IntegrityError as e:
+                if not is_rating_out_of_range(e):
+                    raise
+                messages.error(request, 'Rating must be between 1 and 5.')
         else:
             messages.error(request, 'Please fill in all required fields.')
     
@@ -445,17 +625,19 @@ def review_edit(request, pk):
         rating = request.POST.get('rating')
         review.body = request.POST.get('body')
         
+        # The database checks the 1-5 range (Review.Meta.constraints)
         try:
-            rating = int(rating)
-            if 1 <= rating <= 5:
-                review.rating = rating
+            review.rating = int(rating)
+            with transaction.atomic():
                 review.save()
-                messages.success(request, 'Review updated successfully!')
-                return redirect('book_detail', pk=book.id)
-            else:
-                messages.error(request, 'Rating must be between 1 and 5.')
-        except ValueError:
+            messages.success(request, 'Review updated successfully!')
+            return redirect('book_detail', pk=book.id)
+        except (TypeError, ValueError):
             messages.error(request, 'Invalid rating value.')
+        except IntegrityError as e:
+            if not is_rating_out_of_range(e):
+                raise
+            messages.error(request, 'Rating must be between 1 and 5.')
     
     return render(request, 'quotes/review_form.html', {'book': book, 'review': review})
 
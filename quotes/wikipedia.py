@@ -0,0 +1,169 @@
+"""
+Helpers for fetching author biographies from Wikipedia.
+Both the API and the template views use these, so the HTTP connection
+and the cache of already-fetched bios are shared between them.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from django.core.cache import cache
+
+
+# Wikipedia API endpoint - we'll use this to fetch author biographies
+WIKIPEDIA_API_URL = "https://en.wikipedia.org/w/api.php"
+
+# Wikipedia requires a User-Agent header to identify the application
+WIKIPEDIA_HEADERS = {
+    'User-Agent': 'PoetsCanvas/1.0 (https://github.com/yourusername/poets-canvas; contact@example.com)'
+}
+
+# Bios rarely change, so we keep them for a day
+BIO_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Most titles Wikipedia will return intro extracts for in one request
+# (the API accepts 50 titles, but the extracts module caps exlimit at 20)
+BULK_TITLES_LIMIT = 20
+
+# One session for the whole process. It keeps connections to Wikipedia open
+# between calls, so we don't pay for a new TCP/TLS handshake every time.
+# Brief hiccups (dropped connections, 429/5xx) are retried twice with a short backoff.
+WIKI_SESSION = requests.Session()
+WIKI_SESSION.headers.update(WIKIPEDIA_HEADERS)
+WIKI_SESSION.mount('https://', HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=10,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504)),
+))
+
+
+class BioNotFound(Exception):
+    """Raised when Wikipedia has no usable summary for an author."""
+
+
+def bio_cache_key(author_name):
+    """
+    Cache key for an author's bio - case-insensitive on the name.
+    Spaces are swapped for underscores since some cache backends reject them.
+    """
+    return 'wiki_bio:' + '_'.join(author_name.lower().split())
+
+
+def bio_params(author_name):
+    """Query parameters asking Wikipedia for one author's intro extract."""
+    # We're asking for a brief intro extract in plain text format
+    return {
+        "action": "query",           # Standard Wikipedia API action
+        "format": "json",            # We want JSON response
+        "titles": author_name,       # Search for this author
+        "prop": "extracts",          # Get the article extract
+        "exintro": True,             # Just the intro section (first paragraph)
+        "explaintext": True,         # Plain text, no HTML
+        "redirects": 1               # Follow redirects if author name is slightly different
+    }
+
+
+def summary_from_response(data, author_name):
+    """
+    Pulls the summary out of Wikipedia's JSON response.
+    Raises BioNotFound if there is no article or no summary.
+    """
+    # Check if we got any pages
+    if 'query' not in data or 'pages' not in data['query'] or not data['query']['pages']:
+        raise BioNotFound(f"No Wikipedia article found for {author_name}.")
+    
+    # Wikipedia returns pages in a dict, we just need the first (and usually only) page
+    page = next(iter(data['query']['pages'].values()))
+    
+    # Check if page exists (Wikipedia returns -1 for missing pages)
+    if 'missing' in page or page.get('pageid', -1) == -1:
+        raise BioNotFound(f"No Wikipedia article found for {author_name}.")
+    
+    summary = page.get('extract', 'No summary found.')
+    
+    if not summary or summary == 'No summary found.':
+        raise BioNotFound(f"Wikipedia article found but no summary available for {author_name}.")
+    
+    return summary
+
+
+def fetch_wikipedia_bio(author_name):
+    """
+    Returns the intro paragraph of the author's Wikipedia article.
+    Checks the cache first and only calls Wikipedia on a miss.
+    
+    Raises BioNotFound if there is no article or no summary,
+    and requests.RequestException if the call itself fails.
+    """
+    key = bio_cache_key(author_name)
+    summary = cache.get(key)
+    if summary:
+        return summary
+    
+    # 5 second timeout - we don't want to wait forever if Wikipedia is slow
+    response = WIKI_SESSION.get(WIKIPEDIA_API_URL, params=bio_params(author_name), timeout=5)
+    response.raise_for_status()  # Raise an error if request failed
+    summary = summary_from_response(response.json(), author_name)
+    
+    cache.set(key, summary, timeout=BIO_CACHE_TIMEOUT)
+    return summary
+
+
+def fetch_wikipedia_bios(author_names):
+    """
+    Bulk version of fetch_wikipedia_bio.
+    Returns a dict mapping each author name to its summary; authors with
+    no article or no summary are left out.
+    
+    Cached bios are used as-is. The rest are looked up BULK_TITLES_LIMIT
+    at a time, so N authors cost about N / 20 requests instead of N.
+    Raises requests.RequestException if a call to Wikipedia fails.
+    """
+    bios = {}
+    missing = []
+    for name in dict.fromkeys(author_names):  # Dedupe, keep order
+        summary = cache.get(bio_cache_key(name))
+        if summary:
+            bios[name] = summary
+        else:
+            missing.append(name)
+    
+    for start in range(0, len(missing), BULK_TITLES_LIMIT):
+        batch = missing[start:start + BULK_TITLES_LIMIT]
+        params = {
+            "action": "query",
+            "format": "json",
+            "titles": "|".join(batch),   # Several titles in one request
+            "prop": "extracts",
+            "exintro": True,
+            "explaintext": True,
+            "exlimit": "max",            # Return an extract for every title
+            "redirects": 1
+        }
+        response = WIKI_SESSION.get(WIKIPEDIA_API_URL, params=params, timeout=5)
+        response.raise_for_status()
+        query = response.json().get('query', {})
+        
+        # Wikipedia may rewrite a title twice: first normalizing it
+        # ("john keats" -> "John keats"), then following a redirect
+        # ("John keats" -> "John Keats"). Follow both to find the final title.
+        renamed = {}
+        for item in query.get('normalized', []) + query.get('redirects', []):
+            renamed[item['from']] = item['to']
+        
+        extracts = {}
+        for page in query.get('pages', {}).values():
+            if 'missing' in page or page.get('pageid', -1) == -1:
+                continue
+            if page.get('extract'):
+                extracts[page['title']] = page['extract']
+        
+        for name in batch:
+            title = renamed.get(name, name)
+            title = renamed.get(title, title)
+            summary = extracts.get(title)
+            if summary:
+                bios[name] = summary
+                cache.set(bio_cache_key(name), summary, timeout=BIO_CACHE_TIMEOUT)
+    
+    return bios